@@ -1,13 +1,104 @@
+import csv
+import gzip
 import json
+import os
+import re
+import time
 import boto3
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
 
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Lambda configuration, read once per execution environment
+PROJECT_NAME = os.environ['PROJECT_NAME']
+ENVIRONMENT = os.environ['ENVIRONMENT']
+BUCKET_NAME = os.environ['BUCKET_NAME']
+
+# Maximum number of queries accepted by a single GetMetricData request
+METRIC_DATA_BATCH_SIZE = 500
+
+# Shared client configuration: enough pooled connections for the concurrent
+# checks and client-side adaptive retries for throttled API calls
+CLIENT_CONFIG = Config(
+    max_pool_connections=16,
+    retries={'mode': 'adaptive', 'max_attempts': 5}
+)
+
+# AWS clients are created once per execution environment and reused
+# across warm invocations
+SESSION = boto3.session.Session()
+EC2 = SESSION.client('ec2', config=CLIENT_CONFIG)
+CLOUDWATCH = SESSION.client('cloudwatch', config=CLIENT_CONFIG)
+AUTOSCALING = SESSION.client('autoscaling', config=CLIENT_CONFIG)
+S3 = SESSION.client('s3', config=CLIENT_CONFIG)
+TAGGING = SESSION.client('resourcegroupstaggingapi', config=CLIENT_CONFIG)
+
+# S3 Inventory report folders are named by delivery timestamp, e.g. 2024-01-31T01-00Z/
+INVENTORY_REPORT_DATE = re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}-\d{2}Z/$')
+
+# Estimated monthly savings (USD) from downsizing one instance, by instance family
+DOWNSIZE_SAVINGS_PER_FAMILY = {
+    't3': 20,  # e.g. t3.micro -> t3.nano
+    't4g': 15,
+    'm5': 50,
+    'm6i': 60
+}
+
+# Standing recommendations from the simulated cost analysis
+COST_RECOMMENDATIONS = (
+    "Review AWS Cost Explorer for detailed cost breakdown",
+    "Set up AWS Budgets for proactive cost monitoring",
+    "Consider Reserved Instances for predictable workloads"
+)
+
+# Business hours (UTC) during which running workloads are expected
+BUSINESS_HOURS_UTC = range(8, 19)
+
+# Error codes returned when AWS throttles a request
+THROTTLING_ERROR_CODES = frozenset(('Throttling', 'ThrottlingException', 'ThrottledException', 'RequestLimitExceeded', 'SlowDown'))
+
+# Worker threads for the concurrent checks and the shared instance listing,
+# kept alive across warm invocations
+EXECUTOR = ThreadPoolExecutor(max_workers=6)
+
+# Cost allocation tags every resource must carry
+REQUIRED_TAGS = frozenset(('Project', 'Environment', 'CostCenter', 'Owner'))
+
+# Resource types checked for tagging compliance in addition to EC2 instances.
+# They are found through the Resource Groups Tagging API, which omits
+# resources that have never been tagged, so those are not covered.
+TAGGED_RESOURCE_TYPES = ['s3', 'rds:db']
+
+# Project ASGs and bucket lifecycle rule counts are cached briefly across
+# warm invocations
+CACHE_TTL_SECONDS = 60
+_asg_cache = {}
+_lifecycle_cache = {}
+
+@dataclass
+class Optimization:
+    """Result of a single cost optimization check."""
+    
+    category: str
+    findings: List[str] = field(default_factory=list)
+    recommendations: List[str] = field(default_factory=list)
+    potential_savings: int = 0
+
+def _reraise_throttling(error: ClientError):
+    """Re-raise throttling that outlasts botocore's adaptive retries, so it fails the run."""
+    
+    if error.response['Error']['Code'] in THROTTLING_ERROR_CODES:
+        raise error
+
 def handler(event, context):
     """
     AWS Lambda function for automated cost optimization.
@@ -21,277 +112,457 @@ def handler(event, context):
     """
     
     try:
-        project_name = context.environment['PROJECT_NAME']
-        environment = context.environment['ENVIRONMENT']
-        bucket_name = context.environment['BUCKET_NAME']
+        project_name = PROJECT_NAME
+        environment = ENVIRONMENT
+        bucket_name = BUCKET_NAME
         
         logger.info(f"Starting cost optimization for {project_name}-{environment}")
         
-        # Initialize AWS clients
-        ec2 = boto3.client('ec2')
-        cloudwatch = boto3.client('cloudwatch')
-        autoscaling = boto3.client('autoscaling')
-        s3 = boto3.client('s3')
+        # A single timestamp anchors every time window in this invocation
+        now = datetime.utcnow()
         
         optimization_results = {
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': now.isoformat(),
             'project': project_name,
             'environment': environment,
             'optimizations': []
         }
         
-        # 1. Check EC2 instance utilization
-        instance_optimization = check_instance_utilization(ec2, cloudwatch, project_name, environment)
-        optimization_results['optimizations'].append(instance_optimization)
-        
-        # 2. Check Auto Scaling Group efficiency
-        asg_optimization = check_asg_efficiency(autoscaling, cloudwatch, project_name, environment)
-        optimization_results['optimizations'].append(asg_optimization)
+        # The checks are independent and I/O-bound, so run them concurrently.
+        # EC2 instances are described once and shared by the checks that need
+        # them. The listing is submitted first so it always has a worker while
+        # those checks wait on it, and each check records a listing failure.
+        instances_future = EXECUTOR.submit(list_instances, EC2)
         
-        # 3. Optimize S3 storage
-        s3_optimization = optimize_s3_storage(s3, bucket_name)
-        optimization_results['optimizations'].append(s3_optimization)
+        futures = [
+            # 1. Check EC2 instance utilization
+            EXECUTOR.submit(check_instance_utilization, instances_future, CLOUDWATCH, project_name, environment, now),
+            # 2. Check Auto Scaling Group efficiency
+            EXECUTOR.submit(check_asg_efficiency, AUTOSCALING, CLOUDWATCH, project_name, environment),
+            # 3. Optimize S3 storage
+            EXECUTOR.submit(optimize_s3_storage, S3, bucket_name, now),
+            # 4. Check resource tagging compliance
+            EXECUTOR.submit(check_tagging_compliance, instances_future, TAGGING, project_name, environment),
+            # 5. Identify cost anomalies
+            EXECUTOR.submit(identify_cost_anomalies, CLOUDWATCH, project_name, environment, now)
+        ]
         
-        # 4. Check resource tagging compliance
-        tagging_optimization = check_tagging_compliance(ec2, s3, project_name, environment)
-        optimization_results['optimizations'].append(tagging_optimization)
-        
-        # 5. Identify cost anomalies
-        cost_anomalies = identify_cost_anomalies(cloudwatch, project_name, environment)
-        optimization_results['optimizations'].append(cost_anomalies)
+        # Collect the results in check order
+        optimization_results['optimizations'] = [asdict(future.result()) for future in futures]
         
         logger.info(f"Cost optimization completed: {len(optimization_results['optimizations'])} checks performed")
         
         return {
             'statusCode': 200,
-            'body': json.dumps(optimization_results, indent=2)
+            'body': json.dumps(optimization_results, separators=(',', ':'))
         }
         
     except Exception as e:
         logger.error(f"Error in cost optimization: {str(e)}")
         return {
             'statusCode': 500,
-            'body': json.dumps({'error': str(e)})
+            'body': json.dumps({'error': str(e)}, separators=(',', ':'))
+        }
+
+def list_instances(ec2) -> List[Dict]:
+    """Describe all non-terminated EC2 instances in the account, keeping only the fields the checks use."""
+    
+    paginator = ec2.get_paginator('describe_instances')
+    pages = paginator.paginate(
+        Filters=[
+            {'Name': 'instance-state-name', 'Values': ['pending', 'running', 'shutting-down', 'stopping', 'stopped']}
+        ],
+        PaginationConfig={'PageSize': 1000}
+    )
+    
+    # Drop block device, network and other metadata as each page arrives
+    return [
+        {
+            'InstanceId': instance['InstanceId'],
+            'InstanceType': instance['InstanceType'],
+            'State': instance['State'],
+            'Tags': instance.get('Tags', [])
         }
+        for page in pages
+        for reservation in page['Reservations']
+        for instance in reservation['Instances']
+    ]
 
-def check_instance_utilization(ec2, cloudwatch, project_name: str, environment: str) -> Dict:
+def check_instance_utilization(instances_future: Future, cloudwatch, project_name: str, environment: str, now: datetime) -> Optimization:
     """Check EC2 instance utilization and identify underutilized instances."""
     
-    optimization = {
-        'category': 'EC2 Instance Utilization',
-        'findings': [],
-        'recommendations': [],
-        'potential_savings': 0
-    }
+    optimization = Optimization(category='EC2 Instance Utilization')
     
     try:
-        # Get instances for this project
-        response = ec2.describe_instances(
-            Filters=[
-                {'Name': 'tag:Project', 'Values': [project_name]},
-                {'Name': 'tag:Environment', 'Values': [environment]},
-                {'Name': 'instance-state-name', 'Values': ['running']}
-            ]
+        # Get running instances for this project
+        project_instances = []
+        for instance in instances_future.result():
+            tags = {tag['Key']: tag['Value'] for tag in instance.get('Tags', [])}
+            if (instance['State']['Name'] == 'running'
+                    and tags.get('Project') == project_name
+                    and tags.get('Environment') == environment):
+                project_instances.append(instance)
+        
+        # Get CPU utilization for the last 7 days
+        end_time = now
+        start_time = end_time - timedelta(days=7)
+        
+        cpu_by_instance = get_average_cpu_utilization(
+            cloudwatch,
+            [instance['InstanceId'] for instance in project_instances],
+            start_time,
+            end_time
         )
         
-        for reservation in response['Reservations']:
-            for instance in reservation['Instances']:
-                instance_id = instance['InstanceId']
-                instance_type = instance['InstanceType']
-                
-                # Get CPU utilization for the last 7 days
-                end_time = datetime.utcnow()
-                start_time = end_time - timedelta(days=7)
-                
-                cpu_metrics = cloudwatch.get_metric_statistics(
-                    Namespace='AWS/EC2',
-                    MetricName='CPUUtilization',
-                    Dimensions=[
-                        {'Name': 'InstanceId', 'Value': instance_id}
-                    ],
-                    StartTime=start_time,
-                    EndTime=end_time,
-                    Period=86400,  # 1 day
-                    Statistics=['Average']
-                )
-                
-                if cpu_metrics['Datapoints']:
-                    avg_cpu = sum(dp['Average'] for dp in cpu_metrics['Datapoints']) / len(cpu_metrics['Datapoints'])
-                    
-                    if avg_cpu < 10:
-                        optimization['findings'].append(f"Instance {instance_id} ({instance_type}) has low CPU utilization: {avg_cpu:.1f}%")
-                        optimization['recommendations'].append(f"Consider downsizing {instance_id} or using Spot instances")
-                        
-                        # Estimate potential savings (rough calculation)
-                        if instance_type.startswith('t3.'):
-                            optimization['potential_savings'] += 20  # $20/month for t3.micro -> nano
-                    
-                    elif avg_cpu > 80:
-                        optimization['findings'].append(f"Instance {instance_id} ({instance_type}) has high CPU utilization: {avg_cpu:.1f}%")
-                        optimization['recommendations'].append(f"Consider upsizing {instance_id} or adding more instances")
-        
-        if not optimization['findings']:
-            optimization['findings'].append("All instances have appropriate utilization levels")
+        measured = [
+            (instance['InstanceId'], instance['InstanceType'], cpu_by_instance[instance['InstanceId']])
+            for instance in project_instances
+            if instance['InstanceId'] in cpu_by_instance
+        ]
+        under_utilized = [m for m in measured if m[2] < 10]
+        over_utilized = [m for m in measured if m[2] > 80]
+        
+        optimization.findings.extend(
+            f"Instance {instance_id} ({instance_type}) has low CPU utilization: {avg_cpu:.1f}%"
+            for instance_id, instance_type, avg_cpu in under_utilized
+        )
+        optimization.recommendations.extend(
+            f"Consider downsizing {instance_id} or using Spot instances"
+            for instance_id, _, _ in under_utilized
+        )
+        
+        # Estimate potential savings (rough calculation)
+        optimization.potential_savings += sum(
+            DOWNSIZE_SAVINGS_PER_FAMILY.get(instance_type.split('.', 1)[0], 0)
+            for _, instance_type, _ in under_utilized
+        )
+        
+        optimization.findings.extend(
+            f"Instance {instance_id} ({instance_type}) has high CPU utilization: {avg_cpu:.1f}%"
+            for instance_id, instance_type, avg_cpu in over_utilized
+        )
+        optimization.recommendations.extend(
+            f"Consider upsizing {instance_id} or adding more instances"
+            for instance_id, _, _ in over_utilized
+        )
+        
+        if not optimization.findings:
+            optimization.findings.append("All instances have appropriate utilization levels")
             
-    except Exception as e:
-        optimization['findings'].append(f"Error checking instance utilization: {str(e)}")
+    except ClientError as e:
+        _reraise_throttling(e)
+        optimization.findings.append(f"Error checking instance utilization: {str(e)}")
     
     return optimization
 
-def check_asg_efficiency(autoscaling, cloudwatch, project_name: str, environment: str) -> Dict:
+def get_average_cpu_utilization(cloudwatch, instance_ids: List[str], start_time: datetime, end_time: datetime) -> Dict[str, float]:
+    """Fetch average CPUUtilization over the window for many instances with batched GetMetricData calls."""
+    
+    averages = {}
+    
+    for offset in range(0, len(instance_ids), METRIC_DATA_BATCH_SIZE):
+        batch = instance_ids[offset:offset + METRIC_DATA_BATCH_SIZE]
+        queries = [
+            {
+                'Id': f"m{i}",
+                'MetricStat': {
+                    'Metric': {
+                        'Namespace': 'AWS/EC2',
+                        'MetricName': 'CPUUtilization',
+                        'Dimensions': [
+                            {'Name': 'InstanceId', 'Value': instance_id}
+                        ]
+                    },
+                    'Period': 7 * 86400,  # Whole 7-day window, averaged server-side
+                    'Stat': 'Average'
+                }
+            }
+            for i, instance_id in enumerate(batch)
+        ]
+        
+        # The most recent value for each query is the window average
+        average_by_id = {}
+        request = {
+            'MetricDataQueries': queries,
+            'StartTime': start_time,
+            'EndTime': end_time,
+            'ScanBy': 'TimestampDescending'
+        }
+        while True:
+            response = cloudwatch.get_metric_data(**request)
+            for result in response['MetricDataResults']:
+                if result['Values'] and result['Id'] not in average_by_id:
+                    average_by_id[result['Id']] = result['Values'][0]
+            
+            if 'NextToken' not in response:
+                break
+            request['NextToken'] = response['NextToken']
+        
+        for i, instance_id in enumerate(batch):
+            if f"m{i}" in average_by_id:
+                averages[instance_id] = average_by_id[f"m{i}"]
+    
+    return averages
+
+def check_asg_efficiency(autoscaling, cloudwatch, project_name: str, environment: str) -> Optimization:
     """Check Auto Scaling Group efficiency and scaling patterns."""
     
-    optimization = {
-        'category': 'Auto Scaling Group Efficiency',
-        'findings': [],
-        'recommendations': [],
-        'potential_savings': 0
-    }
+    optimization = Optimization(category='Auto Scaling Group Efficiency')
     
     try:
-        # Get ASGs for this project
-        response = autoscaling.describe_auto_scaling_groups()
+        # Get scheduled actions for all ASGs in one pass, grouped by ASG name
+        scheduled_actions = defaultdict(list)
+        for page in autoscaling.get_paginator('describe_scheduled_actions').paginate():
+            for action in page['ScheduledUpdateGroupActions']:
+                scheduled_actions[action['AutoScalingGroupName']].append(action)
         
-        for asg in response['AutoScalingGroups']:
+        for asg in describe_project_asgs(autoscaling, project_name, environment):
             asg_name = asg['AutoScalingGroupName']
             
-            # Check if this ASG belongs to our project
-            project_tag = next((tag for tag in asg.get('Tags', []) if tag['Key'] == 'Project'), None)
-            if not project_tag or project_tag['Value'] != project_name:
-                continue
-            
             desired = asg['DesiredCapacity']
             min_size = asg['MinSize']
             max_size = asg['MaxSize']
             
-            optimization['findings'].append(f"ASG {asg_name}: Desired={desired}, Min={min_size}, Max={max_size}")
+            optimization.findings.append(f"ASG {asg_name}: Desired={desired}, Min={min_size}, Max={max_size}")
             
             # Check if ASG is oversized
             if desired == max_size and max_size > 2:
-                optimization['recommendations'].append(f"ASG {asg_name} might be oversized - review max capacity")
+                optimization.recommendations.append(f"ASG {asg_name} might be oversized - review max capacity")
             
             # Check scheduled actions
-            scheduled_actions = autoscaling.describe_scheduled_actions(
-                AutoScalingGroupName=asg_name
-            )
-            
-            if not scheduled_actions['ScheduledUpdateGroupActions']:
-                optimization['recommendations'].append(f"Consider adding scheduled scaling to ASG {asg_name} for cost savings")
-                optimization['potential_savings'] += 50  # Estimated monthly savings
+            if not scheduled_actions.get(asg_name):
+                optimization.recommendations.append(f"Consider adding scheduled scaling to ASG {asg_name} for cost savings")
+                optimization.potential_savings += 50  # Estimated monthly savings
             else:
-                optimization['findings'].append(f"ASG {asg_name} has scheduled scaling configured")
+                optimization.findings.append(f"ASG {asg_name} has scheduled scaling configured")
         
-    except Exception as e:
-        optimization['findings'].append(f"Error checking ASG efficiency: {str(e)}")
+    except ClientError as e:
+        _reraise_throttling(e)
+        optimization.findings.append(f"Error checking ASG efficiency: {str(e)}")
     
     return optimization
 
-def optimize_s3_storage(s3, bucket_name: str) -> Dict:
+def describe_project_asgs(autoscaling, project_name: str, environment: str) -> List[Dict]:
+    """Get ASGs for this project, filtered server-side by tag and cached for a short TTL."""
+    
+    key = (project_name, environment)
+    cached = _asg_cache.get(key)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    
+    paginator = autoscaling.get_paginator('describe_auto_scaling_groups')
+    pages = paginator.paginate(
+        Filters=[
+            {'Name': 'tag:Project', 'Values': [project_name]},
+            {'Name': 'tag:Environment', 'Values': [environment]}
+        ]
+    )
+    asgs = [asg for page in pages for asg in page['AutoScalingGroups']]
+    
+    _asg_cache[key] = (time.monotonic() + CACHE_TTL_SECONDS, asgs)
+    return asgs
+
+def get_lifecycle_rule_count(s3, bucket_name: str) -> int:
+    """Return the number of lifecycle rules on a bucket, or 0 if it has no lifecycle configuration, cached for a short TTL."""
+    
+    cached = _lifecycle_cache.get(bucket_name)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    
+    try:
+        rule_count = len(s3.get_bucket_lifecycle_configuration(Bucket=bucket_name)['Rules'])
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'NoSuchLifecycleConfiguration':
+            raise
+        rule_count = 0
+    
+    _lifecycle_cache[bucket_name] = (time.monotonic() + CACHE_TTL_SECONDS, rule_count)
+    return rule_count
+
+def optimize_s3_storage(s3, bucket_name: str, now: datetime) -> Optimization:
     """Analyze S3 storage and optimize storage classes."""
     
-    optimization = {
-        'category': 'S3 Storage Optimization',
-        'findings': [],
-        'recommendations': [],
-        'potential_savings': 0
-    }
+    optimization = Optimization(category='S3 Storage Optimization')
     
     try:
         # Check bucket lifecycle configuration
-        try:
-            lifecycle = s3.get_bucket_lifecycle_configuration(Bucket=bucket_name)
-            optimization['findings'].append(f"Bucket {bucket_name} has {len(lifecycle['Rules'])} lifecycle rules")
-        except s3.exceptions.NoSuchLifecycleConfiguration:
-            optimization['recommendations'].append(f"Add lifecycle policies to bucket {bucket_name}")
-            optimization['potential_savings'] += 30  # Estimated monthly savings
-        
-        # Analyze storage usage
-        response = s3.list_objects_v2(Bucket=bucket_name, MaxKeys=1000)
-        
-        if 'Contents' in response:
-            total_objects = len(response['Contents'])
-            total_size = sum(obj['Size'] for obj in response['Contents'])
-            
-            optimization['findings'].append(f"Bucket contains {total_objects} objects, {total_size / (1024*1024):.1f} MB")
-            
-            # Check for old objects that could be archived
-            old_objects = 0
-            for obj in response['Contents']:
-                age_days = (datetime.now(obj['LastModified'].tzinfo) - obj['LastModified']).days
-                if age_days > 30:
-                    old_objects += 1
+        rule_count = get_lifecycle_rule_count(s3, bucket_name)
+        if rule_count:
+            optimization.findings.append(f"Bucket {bucket_name} has {rule_count} lifecycle rules")
+        else:
+            optimization.recommendations.append(f"Add lifecycle policies to bucket {bucket_name}")
+            optimization.potential_savings += 30  # Estimated monthly savings
+        
+        # Analyze storage usage, preferring the pre-aggregated S3 Inventory report
+        # Objects last modified before the cutoff could be archived
+        archive_cutoff = now - timedelta(days=30)
+        
+        usage = summarize_inventory(s3, bucket_name, archive_cutoff)
+        if usage is None:
+            usage = summarize_objects(s3, bucket_name, archive_cutoff)
+        total_objects, total_size, old_objects = usage
+        
+        if total_objects > 0:
+            optimization.findings.append(f"Bucket contains {total_objects} objects, {total_size / (1024*1024):.1f} MB")
             
             if old_objects > 0:
-                optimization['recommendations'].append(f"{old_objects} objects are older than 30 days - verify lifecycle transitions")
+                optimization.recommendations.append(f"{old_objects} objects are older than 30 days - verify lifecycle transitions")
         
-    except Exception as e:
-        optimization['findings'].append(f"Error analyzing S3 storage: {str(e)}")
+    except ClientError as e:
+        _reraise_throttling(e)
+        optimization.findings.append(f"Error analyzing S3 storage: {str(e)}")
     
     return optimization
 
-def check_tagging_compliance(ec2, s3, project_name: str, environment: str) -> Dict:
-    """Check resource tagging compliance for cost allocation."""
+def summarize_inventory(s3, bucket_name: str, archive_cutoff: datetime) -> Optional[Tuple[int, int, int]]:
+    """Summarize object count, size and age from the latest S3 Inventory report, if one is configured and readable."""
+    
+    try:
+        response = s3.list_bucket_inventory_configurations(Bucket=bucket_name)
+        
+        # Use a daily CSV inventory of current versions that reports size and age
+        config = next(
+            (
+                c for c in response.get('InventoryConfigurationList', [])
+                if c['IsEnabled']
+                and c['Schedule']['Frequency'] == 'Daily'
+                and c['IncludedObjectVersions'] == 'Current'
+                and c['Destination']['S3BucketDestination']['Format'] == 'CSV'
+                and {'Size', 'LastModifiedDate'} <= set(c.get('OptionalFields', []))
+            ),
+            None
+        )
+        if config is None:
+            return None
+        
+        # Reports are delivered to <prefix>/<source bucket>/<config id>/<timestamp>/manifest.json
+        destination = config['Destination']['S3BucketDestination']
+        destination_bucket = destination['Bucket'].split(':::', 1)[-1]
+        report_prefix = '/'.join(filter(None, [destination.get('Prefix', '').strip('/'), bucket_name, config['Id']])) + '/'
+        
+        paginator = s3.get_paginator('list_objects_v2')
+        pages = paginator.paginate(Bucket=destination_bucket, Prefix=report_prefix, Delimiter='/')
+        report_dates = [
+            prefix for prefix in pages.search('CommonPrefixes[].Prefix')
+            if INVENTORY_REPORT_DATE.match(prefix[len(report_prefix):])
+        ]
+        if not report_dates:
+            return None
+        
+        manifest_object = s3.get_object(Bucket=destination_bucket, Key=max(report_dates) + 'manifest.json')
+        manifest = json.loads(manifest_object['Body'].read())
+        
+        columns = [column.strip() for column in manifest['fileSchema'].split(',')]
+        size_index = columns.index('Size')
+        last_modified_index = columns.index('LastModifiedDate')
+        
+        # Inventory timestamps are ISO 8601 UTC strings, so age is a plain string comparison
+        cutoff = archive_cutoff.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+        
+        total_objects = 0
+        total_size = 0
+        old_objects = 0
+        
+        for data_file in manifest['files']:
+            data_object = s3.get_object(Bucket=destination_bucket, Key=data_file['key'])
+            with gzip.open(data_object['Body'], mode='rt', newline='') as rows:
+                for row in csv.reader(rows):
+                    total_objects += 1
+                    total_size += int(row[size_index] or 0)
+                    if row[last_modified_index] < cutoff:
+                        old_objects += 1
+        
+        return total_objects, total_size, old_objects
+    
+    except ClientError as e:
+        _reraise_throttling(e)
+        # An unreadable report (e.g. a cross-account destination) falls back to listing the bucket
+        logger.warning(f"Could not read S3 Inventory for {bucket_name}, listing objects instead: {str(e)}")
+        return None
+    except (BotoCoreError, OSError, EOFError, KeyError, ValueError, csv.Error) as e:
+        # So does a malformed manifest or data file, or a dropped download
+        logger.warning(f"Could not parse S3 Inventory for {bucket_name}, listing objects instead: {str(e)}")
+        return None
+
+def summarize_objects(s3, bucket_name: str, archive_cutoff: datetime) -> Tuple[int, int, int]:
+    """Summarize object count, size and age by listing the bucket, one page of objects at a time."""
+    
+    total_objects = 0
+    total_size = 0
+    old_objects = 0
+    
+    # Compare epoch seconds so each object needs no datetime arithmetic
+    cutoff = archive_cutoff.replace(tzinfo=timezone.utc).timestamp()
+    
+    paginator = s3.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket_name):
+        contents = page.get('Contents', [])
+        total_objects += len(contents)
+        total_size += sum(obj['Size'] for obj in contents)
+        old_objects += sum(1 for obj in contents if obj['LastModified'].timestamp() < cutoff)
+    
+    return total_objects, total_size, old_objects
+
+def check_tagging_compliance(instances_future: Future, tagging, project_name: str, environment: str) -> Optimization:
+    """
+    Check resource tagging compliance for cost allocation.
+    
+    S3 buckets and RDS instances that have never been tagged are not
+    covered, since the Resource Groups Tagging API does not return them.
+    """
     
-    optimization = {
-        'category': 'Tagging Compliance',
-        'findings': [],
-        'recommendations': [],
-        'potential_savings': 0
-    }
+    optimization = Optimization(category='Tagging Compliance')
     
-    required_tags = ['Project', 'Environment', 'CostCenter', 'Owner']
     untagged_resources = []
     
     try:
         # Check EC2 instances
-        response = ec2.describe_instances()
+        for instance in instances_future.result():
+            instance_id = instance['InstanceId']
+            present_tags = {tag['Key'] for tag in instance.get('Tags', ())}
+            
+            missing_tags = REQUIRED_TAGS - present_tags
+            if missing_tags:
+                untagged_resources.append(f"Instance {instance_id} missing tags: {', '.join(sorted(missing_tags))}")
         
-        for reservation in response['Reservations']:
-            for instance in reservation['Instances']:
-                instance_id = instance['InstanceId']
-                tags = {tag['Key']: tag['Value'] for tag in instance.get('Tags', [])}
+        # Check other taggable resources through the Resource Groups Tagging API,
+        # which returns only ARNs and tags. EC2 instances stay on the shared
+        # describe_instances result because GetResources omits never-tagged resources.
+        paginator = tagging.get_paginator('get_resources')
+        for page in paginator.paginate(ResourceTypeFilters=TAGGED_RESOURCE_TYPES):
+            for resource in page['ResourceTagMappingList']:
+                present_tags = {tag['Key'] for tag in resource['Tags']}
                 
-                missing_tags = [tag for tag in required_tags if tag not in tags]
+                missing_tags = REQUIRED_TAGS - present_tags
                 if missing_tags:
-                    untagged_resources.append(f"Instance {instance_id} missing tags: {', '.join(missing_tags)}")
+                    untagged_resources.append(f"Resource {resource['ResourceARN']} missing tags: {', '.join(sorted(missing_tags))}")
         
         if untagged_resources:
-            optimization['findings'].extend(untagged_resources)
-            optimization['recommendations'].append("Apply missing cost allocation tags to resources")
+            optimization.findings.extend(untagged_resources)
+            optimization.recommendations.append("Apply missing cost allocation tags to resources")
         else:
-            optimization['findings'].append("All resources have proper cost allocation tags")
+            optimization.findings.append("All checked resources have proper cost allocation tags")
         
-    except Exception as e:
-        optimization['findings'].append(f"Error checking tagging compliance: {str(e)}")
+    except ClientError as e:
+        _reraise_throttling(e)
+        optimization.findings.append(f"Error checking tagging compliance: {str(e)}")
     
     return optimization
 
-def identify_cost_anomalies(cloudwatch, project_name: str, environment: str) -> Dict:
+def identify_cost_anomalies(cloudwatch, project_name: str, environment: str, now: datetime) -> Optimization:
     """Identify potential cost anomalies and optimization opportunities."""
     
-    optimization = {
-        'category': 'Cost Anomaly Detection',
-        'findings': [],
-        'recommendations': [],
-        'potential_savings': 0
-    }
+    optimization = Optimization(category='Cost Anomaly Detection')
     
-    try:
-        # This would integrate with AWS Cost Explorer API in a real implementation
-        # For demo purposes, we'll simulate some cost analysis
-        
-        optimization['findings'].append("Simulated cost analysis complete")
-        optimization['recommendations'].append("Review AWS Cost Explorer for detailed cost breakdown")
-        optimization['recommendations'].append("Set up AWS Budgets for proactive cost monitoring")
-        optimization['recommendations'].append("Consider Reserved Instances for predictable workloads")
-        
-        # Simulate some cost optimization opportunities
-        current_time = datetime.utcnow().hour
-        if current_time < 8 or current_time > 18:  # Outside business hours
-            optimization['findings'].append("Running outside business hours - opportunity for shutdown")
-            optimization['potential_savings'] += 25
-        
-    except Exception as e:
-        optimization['findings'].append(f"Error in cost anomaly detection: {str(e)}")
+    # This would integrate with AWS Cost Explorer API in a real implementation
+    # For demo purposes, we'll simulate some cost analysis
+    
+    optimization.findings.append("Simulated cost analysis complete")
+    optimization.recommendations.extend(COST_RECOMMENDATIONS)
+    
+    # Simulate some cost optimization opportunities
+    if now.hour not in BUSINESS_HOURS_UTC:
+        optimization.findings.append("Running outside business hours - opportunity for shutdown")
+        optimization.potential_savings += 25
     
     return optimization
\ No newline at end of file
@@ -575,10 +575,16 @@ resource "aws_iam_role_policy" "lambda_policy" {
           "ec2:StopInstances",
           "ec2:TerminateInstances",
           "autoscaling:DescribeAutoScalingGroups",
+          "autoscaling:DescribeScheduledActions",
           "autoscaling:UpdateAutoScalingGroup",
+          "cloudwatch:GetMetricData",
           "s3:ListBucket",
+          "s3:GetLifecycleConfiguration",
+          "s3:GetInventoryConfiguration",
+          "s3:GetObject",
           "s3:GetObjectTagging",
-          "s3:PutObjectTagging"
+          "s3:PutObjectTagging",
+          "tag:GetResources"
         ]
         Resource = "*"
       }
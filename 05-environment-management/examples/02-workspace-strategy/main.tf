@@ -584,10 +584,15 @@ resource "aws_iam_role_policy" "workspace_manager" {
         Action = [
           "ec2:DescribeInstances",
           "ec2:DescribeVpcs",
+          "ec2:DescribeRegions",
           "autoscaling:DescribeAutoScalingGroups",
+          "cloudwatch:GetMetricData",
+          "cloudwatch:ListMetrics",
           "s3:ListBucket",
           "s3:GetObject",
+          "ssm:DescribeParameters",
           "ssm:GetParameter",
+          "ssm:GetParametersByPath",
           "ssm:PutParameter"
         ]
         Resource = "*"
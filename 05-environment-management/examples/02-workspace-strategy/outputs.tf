@@ -48,6 +48,11 @@ output "ssm_parameter_name" {
   value       = aws_ssm_parameter.workspace_config.name
 }
 
+output "workspace_status_parameter_name" {
+  description = "SSM parameter holding the workspace status summary"
+  value       = "/${var.project_name}/${local.workspace}/status"
+}
+
 # Workspace Strategy Information
 output "workspace_strategy" {
   description = "Comprehensive workspace strategy information"
@@ -1,13 +1,105 @@
+import hashlib
 import json
+import os
+import time
 import boto3
 import logging
-from datetime import datetime, timezone
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Any
 
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Shared client configuration: TCP keep-alive on pooled connections so calls
+# reuse established TLS sessions, bounded timeouts so no call can hang, and
+# standard retries
+_CLIENT_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=16,
+    connect_timeout=2,
+    read_timeout=10,
+    retries={'mode': 'standard', 'max_attempts': 3}
+)
+
+# Longest time init waits for client priming, well inside the Lambda init limit
+_PRIME_WAIT_SECONDS = 3
+
+# Bucket the S3 check reports on; it also decides whether CloudWatch is needed
+_BUCKET_NAME = os.environ.get('BUCKET_NAME', '')
+
+# AWS clients are created once per execution environment and reused across
+# warm invocations. They share one session so credentials are resolved once.
+# A failure here is reported by the first invocation instead of crashing
+# the module import.
+try:
+    _SESSION = boto3.session.Session()
+    _EC2 = _SESSION.client('ec2', config=_CLIENT_CONFIG)
+    _ASG = _SESSION.client('autoscaling', config=_CLIENT_CONFIG)
+    _S3 = _SESSION.client('s3', config=_CLIENT_CONFIG)
+    _SSM = _SESSION.client('ssm', config=_CLIENT_CONFIG)
+    # CloudWatch is only used for bucket storage metrics
+    _CW = _SESSION.client('cloudwatch', config=_CLIENT_CONFIG) if _BUCKET_NAME else None
+    _CLIENT_INIT_ERROR = None
+except Exception as e:
+    _EC2 = _ASG = _S3 = _SSM = _CW = None
+    _CLIENT_INIT_ERROR = e
+
+# S3 storage metrics are published once a day, so they are cached per bucket
+# for the current UTC date across warm invocations
+_BUCKET_METRICS_CACHE: Dict[str, Any] = {}
+
+# SSM parameter path reads are cached briefly across warm invocations
+_PARAM_CACHE_TTL_SECONDS = 60
+_PARAM_CACHE: Dict[str, Any] = {}
+
+# Hash and write time of the last status written per status parameter, so
+# unchanged statuses are not rewritten by warm invocations. An unchanged
+# status is still rewritten once its last_check is older than the refresh
+# interval, so last_check keeps showing that the function is running.
+_LAST_STATUS_HASH: Dict[str, Any] = {}
+_STATUS_REFRESH_SECONDS = 3600
+
+# Workspace classes and the subnet types every workspace VPC should have
+_NONPROD = frozenset({'dev', 'test'})
+_EXPECTED_SUBNET_TYPES = ('public', 'private')
+
+def _prime_clients():
+    """Issue one cheap call per client during init to load service models and open pooled connections."""
+    
+    primers = {
+        'ec2': lambda: _EC2.describe_regions(RegionNames=[_SESSION.region_name]),
+        'autoscaling': lambda: _ASG.describe_auto_scaling_groups(MaxRecords=1),
+        'ssm': lambda: _SSM.describe_parameters(MaxResults=1)
+    }
+    if _BUCKET_NAME:
+        primers['s3'] = lambda: _S3.head_bucket(Bucket=_BUCKET_NAME)
+        primers['cloudwatch'] = lambda: _CW.list_metrics(
+            Namespace='AWS/S3',
+            MetricName='NumberOfObjects',
+            Dimensions=[{'Name': 'BucketName', 'Value': _BUCKET_NAME}]
+        )
+    
+    # Priming is best effort; the real calls report their own errors. The
+    # primers run concurrently and init waits a bounded time for them, so a
+    # slow endpoint cannot hold up init. A primer still running then finishes
+    # in the background.
+    executor = ThreadPoolExecutor(max_workers=len(primers))
+    futures = {executor.submit(prime): service for service, prime in primers.items()}
+    done, not_done = wait(futures, timeout=_PRIME_WAIT_SECONDS)
+    executor.shutdown(wait=False)
+    
+    for future in done:
+        if future.exception() is not None:
+            logger.warning("Could not prime %s client: %s", futures[future], future.exception())
+    for future in not_done:
+        logger.warning("Priming the %s client did not finish during init", futures[future])
+
+if _CLIENT_INIT_ERROR is None:
+    _prime_clients()
+
 def handler(event, context) -> Dict[str, Any]:
     """
     AWS Lambda function for Terraform workspace management and monitoring.
@@ -19,81 +111,99 @@ def handler(event, context) -> Dict[str, Any]:
     4. Manages workspace-specific operations
     """
     
+    # Get environment variables
+    workspace = os.environ.get('WORKSPACE', 'unknown')
+    environment = os.environ.get('ENVIRONMENT', 'unknown')
+    project_name = os.environ.get('PROJECT_NAME', 'unknown')
+    vpc_id = os.environ.get('VPC_ID', '')
+    bucket_name = _BUCKET_NAME
+    log_group = os.environ.get('LOG_GROUP', '')
+    
+    logger.info("Workspace manager invoked for workspace: %s", workspace)
+    
+    # One timestamp per invocation, shared by the report, the stored status
+    # and the error response
+    timestamp = datetime.now(timezone.utc).isoformat()
+    
+    # Each check_* function records its own AWS errors in its section, so a
+    # failing service yields a degraded 200 response with the other sections
+    # intact. Only client setup failures and unexpected errors return a 500.
     try:
-        # Get environment variables
-        workspace = context.environment.get('WORKSPACE', 'unknown')
-        environment = context.environment.get('ENVIRONMENT', 'unknown')
-        project_name = context.environment.get('PROJECT_NAME', 'unknown')
-        vpc_id = context.environment.get('VPC_ID', '')
-        bucket_name = context.environment.get('BUCKET_NAME', '')
-        log_group = context.environment.get('LOG_GROUP', '')
-        
-        logger.info(f"Workspace manager invoked for workspace: {workspace}")
-        
-        # Initialize AWS clients
-        ec2 = boto3.client('ec2')
-        autoscaling = boto3.client('autoscaling')
-        s3 = boto3.client('s3')
-        ssm = boto3.client('ssm')
-        cloudwatch = boto3.client('cloudwatch')
+        if _CLIENT_INIT_ERROR is not None:
+            raise _CLIENT_INIT_ERROR
         
         # Gather workspace information
         workspace_info = {
             'workspace': workspace,
             'environment': environment,
             'project_name': project_name,
-            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'timestamp': timestamp,
             'function_name': context.function_name,
             'resources': {},
             'health_checks': {},
             'recommendations': []
         }
         
+        # The resource checks are independent and I/O-bound, so run them concurrently
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            vpc_future = executor.submit(check_vpc_resources, _EC2, vpc_id, workspace) if vpc_id else None
+            asg_future = executor.submit(check_workspace_asgs, _ASG, project_name, workspace)
+            s3_future = executor.submit(check_s3_resources, _S3, _CW, bucket_name, workspace) if bucket_name else None
+            ssm_future = executor.submit(check_ssm_parameters, _SSM, project_name, workspace)
+        
         # Check VPC resources
-        if vpc_id:
-            vpc_info = check_vpc_resources(ec2, vpc_id, workspace)
+        if vpc_future:
+            vpc_info = vpc_future.result()
             workspace_info['resources']['vpc'] = vpc_info
             workspace_info['health_checks']['vpc'] = validate_vpc_health(vpc_info)
         
         # Check Auto Scaling Groups
-        asg_info = check_workspace_asgs(autoscaling, project_name, workspace)
+        asg_info = asg_future.result()
         workspace_info['resources']['autoscaling'] = asg_info
         workspace_info['health_checks']['autoscaling'] = validate_asg_health(asg_info, workspace)
         
         # Check S3 resources
-        if bucket_name:
-            s3_info = check_s3_resources(s3, bucket_name, workspace)
+        if s3_future:
+            s3_info = s3_future.result()
             workspace_info['resources']['s3'] = s3_info
             workspace_info['health_checks']['s3'] = validate_s3_health(s3_info)
         
         # Check SSM parameters
-        ssm_info = check_ssm_parameters(ssm, project_name, workspace)
+        ssm_info = ssm_future.result()
         workspace_info['resources']['ssm'] = ssm_info
         
+        workspace_info['overall_status'] = 'degraded' if any(
+            'error' in resource_info for resource_info in workspace_info['resources'].values()
+        ) else 'ok'
+        
         # Generate workspace-specific recommendations
         workspace_info['recommendations'] = generate_recommendations(workspace_info, workspace)
         
         # Store workspace status in SSM
-        store_workspace_status(ssm, workspace_info, project_name, workspace)
+        store_workspace_status(_SSM, workspace_info, project_name, workspace)
         
-        logger.info(f"Workspace management completed for {workspace}")
+        logger.info("Workspace management completed for %s", workspace)
         
         return {
             'statusCode': 200,
-            'body': json.dumps(workspace_info, indent=2, default=str)
+            'body': json.dumps(workspace_info, separators=(',', ':'), default=str)
         }
         
     except Exception as e:
-        logger.error(f"Error in workspace manager: {str(e)}")
+        logger.error("Error in workspace manager: %s", e)
         return {
             'statusCode': 500,
             'body': json.dumps({
                 'error': str(e),
                 'workspace': workspace,
-                'timestamp': datetime.now(timezone.utc).isoformat()
-            })
+                'timestamp': timestamp
+            }, separators=(',', ':'))
         }
 
+def _tags(resource: Dict[str, Any], key: str = 'Tags') -> Dict[str, str]:
+    """Index an AWS resource's tag list by key."""
+    return {tag['Key']: tag['Value'] for tag in resource.get(key, [])}
+
 def check_vpc_resources(ec2, vpc_id: str, workspace: str) -> Dict[str, Any]:
     """Check VPC and related networking resources."""
     
@@ -107,6 +217,12 @@ def check_vpc_resources(ec2, vpc_id: str, workspace: str) -> Dict[str, Any]:
     }
     
     try:
+        # Filters shared by the subnet, security group and NAT gateway lookups
+        base_filters = [
+            {'Name': 'vpc-id', 'Values': [vpc_id]},
+            {'Name': 'tag:Workspace', 'Values': [workspace]}
+        ]
+        
         # Get VPC details
         vpcs = ec2.describe_vpcs(VpcIds=[vpc_id])
         if vpcs['Vpcs']:
@@ -115,14 +231,11 @@ def check_vpc_resources(ec2, vpc_id: str, workspace: str) -> Dict[str, Any]:
             vpc_info['state'] = vpc['State']
         
         # Get subnets
-        subnets = ec2.describe_subnets(
-            Filters=[
-                {'Name': 'vpc-id', 'Values': [vpc_id]},
-                {'Name': 'tag:Workspace', 'Values': [workspace]}
-            ]
+        subnets = ec2.get_paginator('describe_subnets').paginate(
+            Filters=base_filters
         )
         
-        for subnet in subnets['Subnets']:
+        for subnet in subnets.search('Subnets[]'):
             subnet_info = {
                 'subnet_id': subnet['SubnetId'],
                 'cidr_block': subnet['CidrBlock'],
@@ -132,22 +245,16 @@ def check_vpc_resources(ec2, vpc_id: str, workspace: str) -> Dict[str, Any]:
             }
             
             # Determine subnet type from tags
-            for tag in subnet.get('Tags', []):
-                if tag['Key'] == 'Type':
-                    subnet_info['type'] = tag['Value']
-                    break
+            subnet_info['type'] = _tags(subnet).get('Type', 'unknown')
             
             vpc_info['subnets'].append(subnet_info)
         
         # Get security groups
-        security_groups = ec2.describe_security_groups(
-            Filters=[
-                {'Name': 'vpc-id', 'Values': [vpc_id]},
-                {'Name': 'tag:Workspace', 'Values': [workspace]}
-            ]
+        security_groups = ec2.get_paginator('describe_security_groups').paginate(
+            Filters=base_filters
         )
         
-        for sg in security_groups['SecurityGroups']:
+        for sg in security_groups.search('SecurityGroups[]'):
             sg_info = {
                 'group_id': sg['GroupId'],
                 'group_name': sg['GroupName'],
@@ -158,14 +265,11 @@ def check_vpc_resources(ec2, vpc_id: str, workspace: str) -> Dict[str, Any]:
             vpc_info['security_groups'].append(sg_info)
         
         # Get NAT Gateways
-        nat_gateways = ec2.describe_nat_gateways(
-            Filters=[
-                {'Name': 'vpc-id', 'Values': [vpc_id]},
-                {'Name': 'tag:Workspace', 'Values': [workspace]}
-            ]
+        nat_gateways = ec2.get_paginator('describe_nat_gateways').paginate(
+            Filters=base_filters
         )
         
-        for nat in nat_gateways['NatGateways']:
+        for nat in nat_gateways.search('NatGateways[]'):
             nat_info = {
                 'nat_gateway_id': nat['NatGatewayId'],
                 'subnet_id': nat['SubnetId'],
@@ -175,7 +279,7 @@ def check_vpc_resources(ec2, vpc_id: str, workspace: str) -> Dict[str, Any]:
             vpc_info['nat_gateways'].append(nat_info)
         
     except Exception as e:
-        logger.error(f"Error checking VPC resources: {str(e)}")
+        logger.error("Error checking VPC resources: %s", e)
         vpc_info['error'] = str(e)
     
     return vpc_info
@@ -190,40 +294,41 @@ def check_workspace_asgs(autoscaling, project_name: str, workspace: str) -> Dict
     }
     
     try:
-        # Get ASGs for this workspace
-        response = autoscaling.describe_auto_scaling_groups()
-        
-        for asg in response['AutoScalingGroups']:
-            # Check if ASG belongs to this workspace
-            workspace_match = False
-            for tag in asg.get('Tags', []):
-                if tag['Key'] == 'Workspace' and tag['Value'] == workspace:
-                    workspace_match = True
-                    break
+        # Get ASGs for this workspace, filtered server-side by tag
+        paginator = autoscaling.get_paginator('describe_auto_scaling_groups')
+        pages = paginator.paginate(
+            Filters=[
+                {'Name': 'tag:Workspace', 'Values': [workspace]}
+            ],
+            PaginationConfig={'PageSize': 100}
+        )
+        
+        for asg in pages.search('AutoScalingGroups[]'):
+            current = len(asg['Instances'])
+            healthy = sum(1 for i in asg['Instances'] if i['HealthStatus'] == 'Healthy')
             
-            if workspace_match:
-                asg_details = {
-                    'name': asg['AutoScalingGroupName'],
-                    'min_size': asg['MinSize'],
-                    'max_size': asg['MaxSize'],
-                    'desired_capacity': asg['DesiredCapacity'],
-                    'current_instances': len(asg['Instances']),
-                    'healthy_instances': len([i for i in asg['Instances'] if i['HealthStatus'] == 'Healthy']),
-                    'availability_zones': asg['AvailabilityZones'],
-                    'launch_template': asg.get('LaunchTemplate', {}).get('LaunchTemplateName', 'N/A')
-                }
-                
-                asg_info['auto_scaling_groups'].append(asg_details)
-                asg_info['total_instances'] += len(asg['Instances'])
-                asg_info['healthy_instances'] += len([i for i in asg['Instances'] if i['HealthStatus'] == 'Healthy'])
+            asg_details = {
+                'name': asg['AutoScalingGroupName'],
+                'min_size': asg['MinSize'],
+                'max_size': asg['MaxSize'],
+                'desired_capacity': asg['DesiredCapacity'],
+                'current_instances': current,
+                'healthy_instances': healthy,
+                'availability_zones': asg['AvailabilityZones'],
+                'launch_template': asg.get('LaunchTemplate', {}).get('LaunchTemplateName', 'N/A')
+            }
+            
+            asg_info['auto_scaling_groups'].append(asg_details)
+            asg_info['total_instances'] += current
+            asg_info['healthy_instances'] += healthy
         
     except Exception as e:
-        logger.error(f"Error checking ASGs: {str(e)}")
+        logger.error("Error checking ASGs: %s", e)
         asg_info['error'] = str(e)
     
     return asg_info
 
-def check_s3_resources(s3, bucket_name: str, workspace: str) -> Dict[str, Any]:
+def check_s3_resources(s3, cloudwatch, bucket_name: str, workspace: str) -> Dict[str, Any]:
     """Check S3 bucket resources for the workspace."""
     
     s3_info = {
@@ -253,18 +358,81 @@ def check_s3_resources(s3, bucket_name: str, workspace: str) -> Dict[str, Any]:
         except Exception:
             s3_info['encryption'] = 'Unknown'
         
-        # Get object count and size (sample)
-        objects = s3.list_objects_v2(Bucket=bucket_name, MaxKeys=1000)
-        if 'Contents' in objects:
-            s3_info['object_count'] = len(objects['Contents'])
-            s3_info['total_size_bytes'] = sum(obj['Size'] for obj in objects['Contents'])
+        # Get object count and size from the daily S3 storage metrics
+        s3_info.update(get_bucket_storage_metrics(cloudwatch, bucket_name))
         
     except Exception as e:
-        logger.error(f"Error checking S3 resources: {str(e)}")
+        logger.error("Error checking S3 resources: %s", e)
         s3_info['error'] = str(e)
     
     return s3_info
 
+def get_bucket_storage_metrics(cloudwatch, bucket_name: str) -> Dict[str, int]:
+    """Get bucket object count and size across all storage classes from CloudWatch daily storage metrics."""
+    
+    now = datetime.now(timezone.utc)
+    cached = _BUCKET_METRICS_CACHE.get(bucket_name)
+    if cached and cached[0] == now.date():
+        return cached[1]
+    
+    def storage_query(query_id: str, metric_name: str, storage_type: str) -> Dict[str, Any]:
+        return {
+            'Id': query_id,
+            'MetricStat': {
+                'Metric': {
+                    'Namespace': 'AWS/S3',
+                    'MetricName': metric_name,
+                    'Dimensions': [
+                        {'Name': 'BucketName', 'Value': bucket_name},
+                        {'Name': 'StorageType', 'Value': storage_type}
+                    ]
+                },
+                'Period': 86400,
+                'Stat': 'Average'
+            }
+        }
+    
+    # BucketSizeBytes is published once per storage class the bucket uses
+    # (Standard, IA, Glacier, ...), so size every reported class
+    size_metrics = cloudwatch.get_paginator('list_metrics').paginate(
+        Namespace='AWS/S3',
+        MetricName='BucketSizeBytes',
+        Dimensions=[{'Name': 'BucketName', 'Value': bucket_name}]
+    ).search('Metrics[]')
+    storage_types = sorted({
+        dimension['Value']
+        for metric in size_metrics
+        for dimension in metric['Dimensions']
+        if dimension['Name'] == 'StorageType'
+    })
+    
+    # All metrics in one request; the newest datapoint comes first
+    response = cloudwatch.get_metric_data(
+        MetricDataQueries=[storage_query('object_count', 'NumberOfObjects', 'AllStorageTypes')] + [
+            storage_query(f"size_{index}", 'BucketSizeBytes', storage_type)
+            for index, storage_type in enumerate(storage_types)
+        ],
+        StartTime=now - timedelta(days=2),
+        EndTime=now,
+        ScanBy='TimestampDescending'
+    )
+    
+    metrics = {'object_count': 0, 'total_size_bytes': 0}
+    has_datapoints = False
+    for result in response['MetricDataResults']:
+        if not result['Values']:
+            continue
+        has_datapoints = True
+        if result['Id'] == 'object_count':
+            metrics['object_count'] = int(result['Values'][0])
+        else:
+            metrics['total_size_bytes'] += int(result['Values'][0])
+    
+    # Only cache real datapoints; today's metrics may not be published yet
+    if has_datapoints:
+        _BUCKET_METRICS_CACHE[bucket_name] = (now.date(), metrics)
+    return metrics
+
 def check_ssm_parameters(ssm, project_name: str, workspace: str) -> Dict[str, Any]:
     """Check SSM parameters for the workspace."""
     
@@ -274,37 +442,10 @@ def check_ssm_parameters(ssm, project_name: str, workspace: str) -> Dict[str, An
     }
     
     try:
-        # Check for workspace configuration parameter
+        # List all parameters for this workspace, values included, in one path walk
         config_param_name = f"/{project_name}/{workspace}/config"
         
-        try:
-            param = ssm.get_parameter(Name=config_param_name)
-            ssm_info['workspace_config_exists'] = True
-            ssm_info['config_last_modified'] = param['Parameter']['LastModifiedDate']
-            ssm_info['config_version'] = param['Parameter']['Version']
-            
-            # Parse configuration
-            try:
-                config_data = json.loads(param['Parameter']['Value'])
-                ssm_info['config_data'] = config_data
-            except json.JSONDecodeError:
-                ssm_info['config_data'] = 'Invalid JSON'
-                
-        except ssm.exceptions.ParameterNotFound:
-            ssm_info['workspace_config_exists'] = False
-        
-        # List other parameters for this workspace
-        parameters = ssm.describe_parameters(
-            ParameterFilters=[
-                {
-                    'Key': 'Name',
-                    'Option': 'BeginsWith',
-                    'Values': [f"/{project_name}/{workspace}/"]
-                }
-            ]
-        )
-        
-        for param in parameters['Parameters']:
+        for param in get_params_by_path_cached(ssm, f"/{project_name}/{workspace}/"):
             param_info = {
                 'name': param['Name'],
                 'type': param['Type'],
@@ -312,13 +453,44 @@ def check_ssm_parameters(ssm, project_name: str, workspace: str) -> Dict[str, An
                 'version': param['Version']
             }
             ssm_info['parameters'].append(param_info)
+            
+            # Check for workspace configuration parameter
+            if param['Name'] == config_param_name:
+                ssm_info['workspace_config_exists'] = True
+                ssm_info['config_last_modified'] = param['LastModifiedDate']
+                ssm_info['config_version'] = param['Version']
+                
+                # Parse configuration
+                try:
+                    config_data = json.loads(param['Value'])
+                    ssm_info['config_data'] = config_data
+                except json.JSONDecodeError:
+                    ssm_info['config_data'] = 'Invalid JSON'
         
     except Exception as e:
-        logger.error(f"Error checking SSM parameters: {str(e)}")
+        logger.error("Error checking SSM parameters: %s", e)
         ssm_info['error'] = str(e)
     
     return ssm_info
 
+def get_params_by_path_cached(ssm, path: str) -> List[Dict[str, Any]]:
+    """Get all SSM parameters under a path, reusing a recent read from a warm invocation."""
+    
+    cached = _PARAM_CACHE.get(path)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    
+    pages = ssm.get_paginator('get_parameters_by_path').paginate(
+        Path=path,
+        Recursive=True,
+        WithDecryption=False,
+        PaginationConfig={'PageSize': 10}
+    )
+    params = list(pages.search('Parameters[]'))
+    
+    _PARAM_CACHE[path] = (time.monotonic() + _PARAM_CACHE_TTL_SECONDS, params)
+    return params
+
 def validate_vpc_health(vpc_info: Dict[str, Any]) -> Dict[str, Any]:
     """Validate VPC health and configuration."""
     
@@ -346,8 +518,7 @@ def validate_vpc_health(vpc_info: Dict[str, Any]) -> Dict[str, Any]:
             health['warnings'].append(f"Subnet {subnet['subnet_id']} has low available IPs: {subnet['available_ip_count']}")
     
     # Validate subnet types
-    expected_types = ['public', 'private']
-    for expected_type in expected_types:
+    for expected_type in _EXPECTED_SUBNET_TYPES:
         if expected_type not in subnets_by_type:
             health['warnings'].append(f"No {expected_type} subnets found")
     
@@ -404,42 +575,69 @@ def validate_s3_health(s3_info: Dict[str, Any]) -> Dict[str, Any]:
     
     return health
 
-def generate_recommendations(workspace_info: Dict[str, Any], workspace: str) -> List[str]:
-    """Generate workspace-specific recommendations."""
-    
-    recommendations = []
-    
-    # VPC recommendations
+def _nonprod_vpc_rule(workspace_info: Dict[str, Any]) -> List[str]:
+    """Recommend removing NAT Gateways in non-production VPCs."""
     vpc_info = workspace_info.get('resources', {}).get('vpc', {})
-    if vpc_info:
-        nat_gateways = vpc_info.get('nat_gateways', [])
-        if workspace in ['dev', 'test'] and nat_gateways:
-            recommendations.append("Consider removing NAT Gateways in dev/test environments to reduce costs")
-        elif workspace == 'prod' and not nat_gateways:
-            recommendations.append("Production environment should have NAT Gateways for private subnet internet access")
-    
-    # ASG recommendations
+    if vpc_info and vpc_info.get('nat_gateways', []):
+        return ["Consider removing NAT Gateways in dev/test environments to reduce costs"]
+    return []
+
+def _prod_vpc_rule(workspace_info: Dict[str, Any]) -> List[str]:
+    """Recommend NAT Gateways for production private subnets."""
+    vpc_info = workspace_info.get('resources', {}).get('vpc', {})
+    if vpc_info and not vpc_info.get('nat_gateways', []):
+        return ["Production environment should have NAT Gateways for private subnet internet access"]
+    return []
+
+def _nonprod_asg_rule(workspace_info: Dict[str, Any]) -> List[str]:
+    """Recommend trimming instance counts in non-production workspaces."""
     asg_info = workspace_info.get('resources', {}).get('autoscaling', {})
-    if asg_info:
-        total_instances = asg_info.get('total_instances', 0)
-        if workspace in ['dev', 'test'] and total_instances > 2:
-            recommendations.append("Consider reducing instance count in dev/test environments for cost optimization")
-        elif workspace == 'prod' and total_instances < 3:
-            recommendations.append("Production environment should have at least 3 instances for high availability")
-    
-    # S3 recommendations
+    if asg_info and asg_info.get('total_instances', 0) > 2:
+        return ["Consider reducing instance count in dev/test environments for cost optimization"]
+    return []
+
+def _prod_asg_rule(workspace_info: Dict[str, Any]) -> List[str]:
+    """Recommend at least three instances in production for high availability."""
+    asg_info = workspace_info.get('resources', {}).get('autoscaling', {})
+    if asg_info and asg_info.get('total_instances', 0) < 3:
+        return ["Production environment should have at least 3 instances for high availability"]
+    return []
+
+def _nonprod_s3_rule(workspace_info: Dict[str, Any]) -> List[str]:
+    """Recommend disabling S3 versioning in non-production workspaces."""
     s3_info = workspace_info.get('resources', {}).get('s3', {})
-    if s3_info:
-        if workspace == 'prod' and s3_info.get('versioning') != 'Enabled':
-            recommendations.append("Enable S3 versioning for production environments")
-        elif workspace in ['dev', 'test'] and s3_info.get('versioning') == 'Enabled':
-            recommendations.append("Consider disabling S3 versioning in dev/test to reduce storage costs")
-    
-    # General workspace recommendations
-    if workspace == 'default':
-        recommendations.append("Consider creating dedicated workspaces (dev, staging, prod) instead of using default")
+    if s3_info and s3_info.get('versioning') == 'Enabled':
+        return ["Consider disabling S3 versioning in dev/test to reduce storage costs"]
+    return []
+
+def _prod_s3_rule(workspace_info: Dict[str, Any]) -> List[str]:
+    """Recommend enabling S3 versioning in production."""
+    s3_info = workspace_info.get('resources', {}).get('s3', {})
+    if s3_info and s3_info.get('versioning') != 'Enabled':
+        return ["Enable S3 versioning for production environments"]
+    return []
+
+def _default_workspace_rule(workspace_info: Dict[str, Any]) -> List[str]:
+    """Recommend moving off the default workspace."""
+    return ["Consider creating dedicated workspaces (dev, staging, prod) instead of using default"]
+
+# Recommendation rules per workspace, in VPC, ASG, S3, general order.
+# Workspaces without an entry get no recommendations.
+_NONPROD_RULES = (_nonprod_vpc_rule, _nonprod_asg_rule, _nonprod_s3_rule)
+_WORKSPACE_RULES = {
+    **{workspace: _NONPROD_RULES for workspace in _NONPROD},
+    'prod': (_prod_vpc_rule, _prod_asg_rule, _prod_s3_rule),
+    'default': (_default_workspace_rule,)
+}
+
+def generate_recommendations(workspace_info: Dict[str, Any], workspace: str) -> List[str]:
+    """Generate workspace-specific recommendations."""
     
-    return recommendations
+    return [
+        recommendation
+        for rule in _WORKSPACE_RULES.get(workspace, ())
+        for recommendation in rule(workspace_info)
+    ]
 
 def store_workspace_status(ssm, workspace_info: Dict[str, Any], project_name: str, workspace: str):
     """Store workspace status in SSM for monitoring."""
@@ -468,6 +666,17 @@ def store_workspace_status(ssm, workspace_info: Dict[str, Any], project_name: st
                 status_summary['overall_health'] = 'unhealthy'
                 break
         
+        # Skip the write when nothing but the check time has changed and the
+        # stored check time is still recent
+        comparable = {k: v for k, v in status_summary.items() if k != 'last_check'}
+        status_hash = hashlib.blake2b(
+            json.dumps(comparable, sort_keys=True, default=str).encode(),
+            digest_size=16
+        ).hexdigest()
+        last_hash, last_written = _LAST_STATUS_HASH.get(status_param_name, (None, 0.0))
+        if last_hash == status_hash and time.monotonic() - last_written < _STATUS_REFRESH_SECONDS:
+            return
+        
         ssm.put_parameter(
             Name=status_param_name,
             Value=json.dumps(status_summary, default=str),
@@ -475,6 +684,8 @@ def store_workspace_status(ssm, workspace_info: Dict[str, Any], project_name: st
             Overwrite=True,
             Description=f"Workspace status for {workspace}"
         )
+        _PARAM_CACHE.pop(f"/{project_name}/{workspace}/", None)
+        _LAST_STATUS_HASH[status_param_name] = (status_hash, time.monotonic())
         
     except Exception as e:
-        logger.error(f"Error storing workspace status: {str(e)}")
\ No newline at end of file
+        logger.error("Error storing workspace status: %s", e)
\ No newline at end of file